@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# Benchmark serial vs --parallel parsing of a synthetic state-level dump built by
+# repeating profissionais_text.txt with renumbered CNES codes.
+# Usage: python scripts/archive/etl/bench_parse_parallel.py [n_units] [workers,...]
+import os
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from parse_profissionais_text import parse_lines, parse_parallel
+
+SOURCE = 'uploads/processed/profissionais_text.txt'
+
+
+def synthetic_dump(path, n_units):
+    text = Path(SOURCE).read_text(encoding='utf-8')
+    per_copy = len(re.findall(r'^CNES\s*:', text, re.M))
+    copies = max(1, n_units // per_copy)
+    counter = iter(range(10 ** 7))
+    with open(path, 'w', encoding='utf-8') as f:
+        for _ in range(copies):
+            f.write(re.sub(r'^CNES(\s*:\s*)\d+', lambda m: f'CNES{m.group(1)}{next(counter):07d}',
+                           text, flags=re.M))
+    return copies * per_copy
+
+
+def main():
+    n_units = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    cpus = os.cpu_count() or 1
+    workers = [int(w) for w in sys.argv[2].split(',')] if len(sys.argv) > 2 else sorted({1, 2, 4, cpus})
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'dump.txt'
+        units = synthetic_dump(path, n_units)
+        print(f'{units} units, {path.stat().st_size / 1e6:.1f} MB, {cpus} CPUs')
+        t0 = time.perf_counter()
+        expected = parse_lines(path.read_text(encoding='utf-8').splitlines())
+        serial = time.perf_counter() - t0
+        print(f'serial          {serial:6.2f}s  {len(expected)} rows')
+        for w in workers:
+            t0 = time.perf_counter()
+            rows = parse_parallel(path, w)
+            dt = time.perf_counter() - t0
+            status = 'ok' if rows == expected else 'MISMATCH'
+            print(f'parallel w={w:<3d}  {dt:6.2f}s  speedup {serial / dt:4.2f}x  {status}')
+
+
+if __name__ == '__main__':
+    main()
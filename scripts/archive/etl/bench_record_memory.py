@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# Compare the per-record memory footprint of the professional row representations:
+# list of 7 str (old parse_profissionais_text.py), csv.DictReader dict (old
+# clean_profissionais_parsed.py) and the slotted, interned Profissional record.
+# Usage: python scripts/archive/etl/bench_record_memory.py [n_records]
+import csv
+import gc
+import io
+import random
+import sys
+import tracemalloc
+
+from profissional_record import FIELDS, Profissional
+
+N_UNITS = 5000
+N_CBOS = 400
+
+
+def synthetic_dump(n, seed=0):
+    """Serialize n synthetic rows to CSV text; values are read back as fresh strings,
+    as they would be when parsing a real dump."""
+    rnd = random.Random(seed)
+    units = [(f'{i:07d}', f'UNIDADE BASICA DE SAUDE NUMERO {i}') for i in range(N_UNITS)]
+    cbos = [(f'{225100 + i}', f'MEDICO ESPECIALIDADE {i} DA ESTRATEGIA DE SAUDE') for i in range(N_CBOS)]
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    w.writerow(FIELDS)
+    for i in range(n):
+        cnes, unidade = units[rnd.randrange(N_UNITS)]
+        cbo_code, cbo_text = cbos[rnd.randrange(N_CBOS)]
+        w.writerow([cnes, unidade, f'{i:011d}', f'7{i:014d}', f'PROFISSIONAL {i} DA SILVA',
+                    cbo_code, cbo_text])
+    return buf.getvalue()
+
+
+def load_lists(text):
+    rdr = csv.reader(io.StringIO(text))
+    next(rdr)
+    return [row for row in rdr]
+
+
+def load_dicts(text):
+    return [r for r in csv.DictReader(io.StringIO(text))]
+
+
+def load_records(text):
+    return [Profissional.from_dict(r) for r in csv.DictReader(io.StringIO(text))]
+
+
+def measure(loader, text):
+    gc.collect()
+    tracemalloc.start()
+    rows = loader(text)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    n = len(rows)
+    del rows
+    return current / n, peak
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    text = synthetic_dump(n)
+    print(f'{n} records, {N_UNITS} units, {N_CBOS} CBOs')
+    print(f'{"representation":24s} {"bytes/record":>12s} {"peak MB":>9s}')
+    for name, loader in (('list[str]', load_lists), ('DictReader dict', load_dicts),
+                         ('Profissional (slots)', load_records)):
+        per_rec, peak = measure(loader, text)
+        print(f'{name:24s} {per_rec:12.0f} {peak / 1e6:9.1f}')
+
+
+if __name__ == '__main__':
+    main()
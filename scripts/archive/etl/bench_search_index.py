@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# Benchmark the FTS5 search index on a synthetic dataset N times the size of
+# profissionais_parsed_clean.csv (default 100x).
+# Usage: python scripts/archive/etl/bench_search_index.py [scale]
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from export_search_index import (PROFISSIONAIS_CSV, UNIDADES_CSV, build_index, read_csv,
+                                 search_profissionais, search_unidades)
+
+QUERIES = [
+    ('profissionais', 'ana', None),
+    ('profissionais', 'mar sil', 'nome'),
+    ('profissionais', 'enfermeiro', 'cbo_text'),
+    ('profissionais', 'médico clínico', 'cbo_text'),
+    ('profissionais', 'odont', 'cbo_text'),
+    ('unidades', 'saude', 'nome'),
+    ('unidades', 'centro', 'endereco'),
+]
+
+
+def synthetic(scale, seed=0):
+    rnd = random.Random(seed)
+    base_prof = list(read_csv(PROFISSIONAIS_CSV))
+    base_unid = list(read_csv(UNIDADES_CSV))
+    first = [r['nome'].split()[0] for r in base_prof]
+    last = [w for r in base_prof for w in r['nome'].split()[1:]]
+    profs, unids = [], []
+    for k in range(scale):
+        for r in base_unid:
+            u = dict(r)
+            u['cnes'] = f"{k:03d}{r['cnes']}"
+            unids.append(u)
+        for r in base_prof:
+            p = dict(r)
+            p['cnes'] = f"{k:03d}{r['cnes']}"
+            p['nome'] = ' '.join([rnd.choice(first)] + rnd.sample(last, 3))
+            profs.append(p)
+    return profs, unids
+
+
+def main():
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    profs, unids = synthetic(scale)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / 'bench.sqlite'
+        conn = sqlite3.connect(db)
+        t0 = time.perf_counter()
+        build_index(conn, profs, unids)
+        build_s = time.perf_counter() - t0
+        print(f'{len(profs)} profissionais, {len(unids)} unidades (scale {scale}x)')
+        print(f'build: {build_s:.2f}s, size: {db.stat().st_size / 1e6:.1f} MB')
+        for table, query, column in QUERIES:
+            fn = search_profissionais if table == 'profissionais' else search_unidades
+            fn(conn, query, column)  # warm page cache
+            runs = 50
+            t0 = time.perf_counter()
+            for _ in range(runs):
+                hits = fn(conn, query, column)
+            ms = (time.perf_counter() - t0) / runs * 1000
+            label = f'{column}:{query}' if column else query
+            print(f'  {table:13s} {label:28s} {ms:7.2f} ms  ({len(hits)} hits, limit 20)')
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
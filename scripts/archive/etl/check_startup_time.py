@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# Check that `etl.py --help` and `etl.py <command> --help` stay within their
+# startup budget.
+#
+# Runs the CLI under `python -X importtime` and fails (exit 1) when the
+# cumulative import time exceeds BUDGET_MS, when a heavy module is imported
+# during dispatch, or when `<command> --help` imports the command's script.
+# Usage: python scripts/archive/etl/check_startup_time.py [budget_ms]
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from etl import COMMANDS
+
+ETL = Path(__file__).resolve().parent / 'etl.py'
+BUDGET_MS = 100
+HEAVY = {'pdfplumber', 'pandas', 'numpy', 'requests', 'urllib.request', 'tabula', 'sqlite3'}
+RUNS = 5
+
+line_re = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def import_profile(args):
+    proc = subprocess.run([sys.executable, '-X', 'importtime', str(ETL)] + args,
+                          capture_output=True, text=True)
+    total_us = 0
+    modules = set()
+    for ln in proc.stderr.splitlines():
+        m = line_re.match(ln)
+        if not m:
+            continue
+        modules.add(m.group(4))
+        # only top-level entries: their cumulative time already includes nested imports
+        if len(m.group(3)) == 1:
+            total_us += int(m.group(2))
+    return proc.returncode, total_us / 1000, modules
+
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else BUDGET_MS
+    failed = False
+    cases = [['--help'], ['no-such-command']] + [[name, '--help'] for name in COMMANDS]
+    for args in cases:
+        # best of several runs, to ignore a cold filesystem cache
+        results = [import_profile(args) for _ in range(RUNS)]
+        ms = min(r[1] for r in results)
+        # `<command> --help` must not import (and so run) the command's script either
+        forbidden = HEAVY | ({COMMANDS[args[0]][0]} if args[0] in COMMANDS else set())
+        heavy = sorted(forbidden & results[0][2])
+        code = results[0][0]
+        ok = ms <= budget and not heavy and code in (0, 2)
+        failed |= not ok
+        label = 'etl.py ' + ' '.join(args)
+        print(f"{label:30s} imports {ms:6.1f} ms (budget {budget:.0f} ms)"
+              f"{'  heavy: ' + ', '.join(heavy) if heavy else ''}  {'ok' if ok else 'FAIL'}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# Unified entry point for the ETL scripts in this folder.
+#
+#   python scripts/archive/etl/etl.py <command> [options of the script]
+#
+# Dispatch only imports the module of the chosen command, so `--help`,
+# `<command> --help` and unknown commands never load pdfplumber, pandas,
+# requests or urllib, and never run a step.
+# Keep this file free of heavy top-level imports: check_startup_time.py
+# enforces its import budget.
+import sys
+
+# command -> (module, description)
+COMMANDS = {
+    'extract-text': ('extract_pdf_text', 'PDF -> profissionais_text.txt (OCR for pages without text)'),
+    'extract-tables': ('extract_pdf_tables', 'PDF -> one CSV per table (pdfplumber)'),
+    'extract-tabula': ('extract_with_tabula', 'PDF -> one CSV per table (tabula-py, needs Java)'),
+    'parse': ('parse_profissionais_text', 'profissionais_text.txt -> profissionais_parsed.csv'),
+    'clean': ('clean_profissionais_parsed', 'keep valid rows -> profissionais_parsed_clean.csv + summary'),
+    'unidades': ('generate_unidades_cnes', 'profissionais_parsed_clean.csv -> unidades_cnes.md'),
+    'fetch-addresses': ('fetch_cnes_addresses', 'fetch CNES detail pages -> unidades_cnes_updates.csv'),
+    'retry-missing': ('retry_missing_cnes', 'retry CNES detail pages that failed before'),
+    'merge-whatsapp': ('merge_whatsapp', 'unidades_telefones.csv -> unidades_cnes_with_whatsapp.md'),
+    'final-csv': ('generate_unidades_final_csv', 'merge addresses and WhatsApp -> unidades_cnes_final.csv'),
+    'search-index': ('export_search_index', 'build the FTS5 search database busca.sqlite'),
+    'ingest-pois': ('ingest_pois', 'stream and validate pharmacy/POI JSON -> JSON lines'),
+    'watch': ('etl_daemon', 'watch uploads/ and rerun affected steps'),
+}
+
+
+def usage():
+    lines = ['usage: etl.py <command> [options]', '', 'commands:']
+    width = max(map(len, COMMANDS))
+    for name, (_, desc) in COMMANDS.items():
+        lines.append(f'  {name:{width}s}  {desc}')
+    lines.append('')
+    lines.append('Run from the repository root; options are passed to the command unchanged.')
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help', 'help'):
+        print(usage())
+        return 0
+    name, args = argv[0], argv[1:]
+    if name not in COMMANDS:
+        print(f'etl.py: unknown command {name!r}\n', file=sys.stderr)
+        print(usage(), file=sys.stderr)
+        return 2
+    module_name, desc = COMMANDS[name]
+    if '-h' in args or '--help' in args:
+        # the scripts have no --help of their own: answer here, without importing them
+        print(f'usage: etl.py {name} [options]\n\n{desc}\n\n'
+              f'Options are passed unchanged to {module_name}.py.')
+        return 0
+    import importlib
+    module = importlib.import_module(module_name)
+    # the scripts read their flags from sys.argv
+    sys.argv = [f'{module_name}.py'] + args
+    module.main()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# Watch uploads/ and rerun only the ETL steps affected by a new or changed file.
+#
+# Steps run in a pool of pre-warmed worker processes (pdfplumber, pandas and
+# requests already imported), each step being the unchanged script executed
+# with runpy from the repository root. Independent steps of the same batch run
+# concurrently; a failed step skips everything downstream of it.
+#
+# Uses inotify (inotify_simple) when available, otherwise polls mtimes.
+# Per-file latency (detection -> last affected step done) and per-step timings
+# are printed and appended as JSON lines to uploads/processed/etl_metrics.jsonl.
+#
+# Usage (from the repository root):
+#   python scripts/archive/etl/etl_daemon.py [--workers=N] [--poll]
+import json
+import os
+import queue
+import runpy
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+try:
+    import inotify_simple
+except Exception:
+    inotify_simple = None
+
+ETL_DIR = Path(__file__).resolve().parent
+UPLOADS = 'uploads'
+METRICS = 'uploads/processed/etl_metrics.jsonl'
+WATCH_DIRS = ['uploads', 'uploads/processed']
+DEBOUNCE = 1.0
+POLL_INTERVAL = 2.0
+WARM_MODULES = ['pdfplumber', 'pandas', 'requests']
+
+# Pipeline in dependency order. Paths are relative to uploads/.
+STEPS = [
+    ('extract_pdf_text', ['profissionais_por_unidade_do_municipio.pdf'],
+     ['processed/profissionais_text.txt']),
+    # after extract_pdf_text: it fills the shared page cache, so the PDF is parsed
+    # once and the two steps never write the same cache pages concurrently
+    ('extract_pdf_tables', ['profissionais_por_unidade_do_municipio.pdf', 'processed/profissionais_text.txt'],
+     ['processed/profissionais_report.txt']),
+    ('parse_profissionais_text', ['processed/profissionais_text.txt'],
+     ['processed/profissionais_parsed.csv']),
+    ('clean_profissionais_parsed', ['processed/profissionais_parsed.csv'],
+     ['processed/profissionais_parsed_clean.csv', 'processed/profissionais_summary.txt']),
+    ('generate_unidades_cnes', ['processed/profissionais_parsed_clean.csv'],
+     ['processed/unidades_cnes.md']),
+    ('fetch_cnes_addresses', ['processed/cnes_listing_raw.html', 'processed/unidades_cnes.md'],
+     ['processed/unidades_cnes_updates.csv', 'processed/unidades_cnes_with_addresses.md']),
+    ('merge_whatsapp', ['processed/unidades_telefones.csv', 'processed/unidades_cnes_with_addresses.md'],
+     ['processed/unidades_cnes_with_whatsapp.md']),
+    ('generate_unidades_final_csv', ['processed/unidades_cnes_updates.csv', 'processed/unidades_cnes_with_whatsapp.md'],
+     ['processed/unidades_cnes_final.csv']),
+    ('export_search_index', ['processed/profissionais_parsed_clean.csv', 'processed/unidades_cnes_final.csv'],
+     ['processed/busca.sqlite']),
+]
+STEP_INPUTS = {name: set(ins) for name, ins, _ in STEPS}
+STEP_OUTPUTS = {name: set(outs) for name, _, outs in STEPS}
+ALL_OUTPUTS = set().union(*STEP_OUTPUTS.values())
+
+
+def upstream(step):
+    """Steps whose outputs feed `step`."""
+    return {name for name, outs in STEP_OUTPUTS.items() if outs & STEP_INPUTS[step]}
+
+
+def affected_steps(changed):
+    """Steps to rerun, in pipeline order, for a set of changed paths (relative to uploads/)."""
+    dirty = set(changed)
+    steps = []
+    for name, ins, outs in STEPS:
+        if dirty & set(ins):
+            steps.append(name)
+            dirty |= set(outs)
+    return steps
+
+
+def _warm_worker(root):
+    os.chdir(root)
+    sys.path.insert(0, str(ETL_DIR))
+    for mod in WARM_MODULES:
+        try:
+            __import__(mod)
+        except Exception:
+            pass
+
+
+def _run_step(name):
+    script = ETL_DIR / f'{name}.py'
+    t0 = time.perf_counter()
+    sys.argv = [str(script)]
+    try:
+        runpy.run_path(str(script), run_name='__main__')
+        ok = True
+    except SystemExit as e:
+        ok = e.code in (None, 0)
+    return name, ok, time.perf_counter() - t0
+
+
+def run_batch(pool, changed):
+    """Run the steps affected by `changed`; returns {step: (ok, seconds, finished_at)}."""
+    steps = affected_steps(changed)
+    pending = {s: upstream(s) & set(steps) for s in steps}
+    results = {}
+    running = {}
+    while pending or running:
+        for s in [s for s, deps in pending.items() if deps <= results.keys()]:
+            deps = pending.pop(s)
+            if all(results[d][0] for d in deps):
+                running[pool.submit(_run_step, s)] = s
+            else:
+                results[s] = (False, 0.0, time.time())
+                print(f'  skip {s}: upstream step failed')
+        if not running:
+            continue
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for fut in done:
+            s = running.pop(fut)
+            try:
+                _, ok, secs = fut.result()
+            except Exception as e:
+                print(f'  {s} failed: {e!r}')
+                ok, secs = False, 0.0
+            results[s] = (ok, secs, time.time())
+            print(f"  {s}: {'ok' if ok else 'FAILED'} in {secs:.2f}s")
+    return results
+
+
+def record_metrics(changed, detected, results):
+    Path(METRICS).parent.mkdir(parents=True, exist_ok=True)
+    with open(METRICS, 'a', encoding='utf-8') as f:
+        for path in sorted(changed):
+            steps = affected_steps({path})
+            finished = max((results[s][2] for s in steps if s in results), default=time.time())
+            entry = {
+                'file': path,
+                'detected_at': detected[path],
+                'latency_s': round(finished - detected[path], 3),
+                'ok': all(results[s][0] for s in steps if s in results),
+                'steps': {s: round(results[s][1], 3) for s in steps if s in results},
+            }
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            print(f"{path}: {'ok' if entry['ok'] else 'FAILED'}, latency {entry['latency_s']:.2f}s")
+
+
+def relevant(rel):
+    # step outputs are written by the daemon itself; only inputs trigger a run
+    return rel not in ALL_OUTPUTS and any(rel in ins for ins in STEP_INPUTS.values())
+
+
+def inotify_events():
+    ino = inotify_simple.INotify()
+    flags = inotify_simple.flags
+    wds = {}
+    for d in WATCH_DIRS:
+        Path(d).mkdir(parents=True, exist_ok=True)
+        wds[ino.add_watch(d, flags.CLOSE_WRITE | flags.MOVED_TO)] = Path(d)
+    while True:
+        for ev in ino.read(timeout=None):
+            yield (wds[ev.wd] / ev.name).relative_to(UPLOADS).as_posix()
+
+
+def polling_events():
+    def snapshot():
+        snap = {}
+        for d in WATCH_DIRS:
+            for p in Path(d).glob('*'):
+                if p.is_file():
+                    st = p.stat()
+                    snap[p.relative_to(UPLOADS).as_posix()] = (st.st_mtime_ns, st.st_size)
+        return snap
+
+    prev = snapshot()
+    while True:
+        time.sleep(POLL_INTERVAL)
+        cur = snapshot()
+        for rel, sig in cur.items():
+            if prev.get(rel) != sig:
+                yield rel
+        prev = cur
+
+
+def batches(events):
+    """Group events arriving within DEBOUNCE seconds; yields {path: detected_at}."""
+    q = queue.Queue()
+
+    def reader():
+        for rel in events:
+            q.put((rel, time.time()))
+
+    threading.Thread(target=reader, daemon=True).start()
+    while True:
+        rel, ts = q.get()
+        batch = {rel: ts}
+        while True:
+            try:
+                rel, ts = q.get(timeout=DEBOUNCE)
+            except queue.Empty:
+                break
+            batch.setdefault(rel, ts)
+        yield batch
+
+
+def main():
+    workers = next((int(a.split('=', 1)[1]) for a in sys.argv if a.startswith('--workers=')), 2)
+    use_inotify = inotify_simple is not None and '--poll' not in sys.argv
+    root = os.getcwd()
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker, initargs=(root,))
+    # force the workers to start (and import the heavy modules) before the first upload
+    list(pool.map(time.sleep, [0.2] * workers))
+    print(f"Watching {', '.join(WATCH_DIRS)} ({'inotify' if use_inotify else 'polling'}), "
+          f'{workers} warm workers')
+    events = inotify_events() if use_inotify else polling_events()
+    try:
+        for batch in batches(events):
+            changed = {rel: ts for rel, ts in batch.items() if relevant(rel)}
+            if not changed:
+                continue
+            print(f"Changed: {', '.join(sorted(changed))}")
+            results = run_batch(pool, set(changed))
+            record_metrics(set(changed), changed, results)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# Build a SQLite database with FTS5 indexes over professionals and units.
+# Professional names, CBO descriptions and unit names/addresses are indexed
+# accent-folded with merge_whatsapp.normalize(), so queries must go through
+# the same function (see match_expression()).
+import csv
+import sqlite3
+import sys
+from pathlib import Path
+
+from merge_whatsapp import normalize
+
+PROFISSIONAIS_CSV = 'uploads/processed/profissionais_parsed_clean.csv'
+UNIDADES_CSV = 'uploads/processed/unidades_cnes_final.csv'
+OUT_DB = 'uploads/processed/busca.sqlite'
+
+SCHEMA = """
+CREATE TABLE unidades (
+    cnes TEXT PRIMARY KEY,
+    nome TEXT NOT NULL,
+    endereco TEXT,
+    telefone TEXT,
+    whatsapp TEXT
+);
+CREATE TABLE profissionais (
+    id INTEGER PRIMARY KEY,
+    cnes TEXT NOT NULL,
+    unidade TEXT NOT NULL,
+    cpf TEXT,
+    cns TEXT,
+    nome TEXT NOT NULL,
+    cbo_code TEXT,
+    cbo_text TEXT
+);
+CREATE INDEX profissionais_cnes ON profissionais(cnes);
+CREATE INDEX profissionais_cbo_code ON profissionais(cbo_code);
+-- contentless: the original values live in the tables above, joined by rowid
+CREATE VIRTUAL TABLE profissionais_fts USING fts5(
+    nome, cbo_text, unidade, content='', prefix='2 3', tokenize='unicode61'
+);
+CREATE VIRTUAL TABLE unidades_fts USING fts5(
+    nome, endereco, content='', prefix='2 3', tokenize='unicode61'
+);
+"""
+
+
+def read_csv(path):
+    with open(path, encoding='utf-8', errors='ignore') as f:
+        yield from csv.DictReader(f)
+
+
+def build_index(conn, profissionais, unidades):
+    """Create the schema on `conn` and load the given row dicts into it."""
+    conn.executescript(SCHEMA)
+    with conn:
+        for i, r in enumerate(profissionais, start=1):
+            conn.execute(
+                'INSERT INTO profissionais VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (i, r['cnes'], r['unidade'], r.get('cpf', ''), r.get('cns', ''),
+                 r['nome'], r.get('cbo_code', ''), r.get('cbo_text', '')))
+            conn.execute(
+                'INSERT INTO profissionais_fts(rowid, nome, cbo_text, unidade) VALUES (?, ?, ?, ?)',
+                (i, normalize(r['nome']), normalize(r.get('cbo_text', '')), normalize(r['unidade'])))
+        for r in unidades:
+            cur = conn.execute(
+                'INSERT OR IGNORE INTO unidades VALUES (?, ?, ?, ?, ?)',
+                (r['cnes'].strip(), r['nome'], r.get('endereco', ''),
+                 r.get('telefone', ''), r.get('whatsapp', '')))
+            if cur.rowcount:
+                conn.execute(
+                    'INSERT INTO unidades_fts(rowid, nome, endereco) VALUES (?, ?, ?)',
+                    (cur.lastrowid, normalize(r['nome']), normalize(r.get('endereco', ''))))
+    conn.execute("INSERT INTO profissionais_fts(profissionais_fts) VALUES ('optimize')")
+    conn.execute("INSERT INTO unidades_fts(unidades_fts) VALUES ('optimize')")
+    conn.commit()
+
+
+def match_expression(query, column=None):
+    """Turn free text into an FTS5 prefix query, e.g. 'Ana Mar' -> '"ana"* "mar"*'.
+
+    Returns '' when nothing searchable is left after normalization.
+    """
+    tokens = normalize(query).split()
+    if not tokens:
+        return ''
+    expr = ' '.join(f'"{t}"*' for t in tokens)
+    if column:
+        expr = f'{column} : ({expr})'
+    return expr
+
+
+def search_profissionais(conn, query, column=None, limit=20):
+    expr = match_expression(query, column)
+    if not expr:
+        return []
+    return conn.execute(
+        'SELECT p.cnes, p.unidade, p.nome, p.cbo_code, p.cbo_text'
+        ' FROM profissionais_fts JOIN profissionais p ON p.id = profissionais_fts.rowid'
+        ' WHERE profissionais_fts MATCH ? ORDER BY rank LIMIT ?',
+        (expr, limit)).fetchall()
+
+
+def search_unidades(conn, query, column=None, limit=20):
+    expr = match_expression(query, column)
+    if not expr:
+        return []
+    return conn.execute(
+        'SELECT u.cnes, u.nome, u.endereco, u.telefone, u.whatsapp'
+        ' FROM unidades_fts JOIN unidades u ON u.rowid = unidades_fts.rowid'
+        ' WHERE unidades_fts MATCH ? ORDER BY rank LIMIT ?',
+        (expr, limit)).fetchall()
+
+
+def main():
+    out = Path(OUT_DB)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    if out.exists():
+        out.unlink()
+    conn = sqlite3.connect(out)
+    try:
+        build_index(conn, read_csv(PROFISSIONAIS_CSV), read_csv(UNIDADES_CSV))
+        n_prof = conn.execute('SELECT count(*) FROM profissionais').fetchone()[0]
+        n_unid = conn.execute('SELECT count(*) FROM unidades').fetchone()[0]
+    finally:
+        conn.close()
+    print(f'Indexed {n_prof} profissionais and {n_unid} unidades into {OUT_DB}')
+    if len(sys.argv) > 1:
+        conn = sqlite3.connect(out)
+        for row in search_profissionais(conn, ' '.join(sys.argv[1:])):
+            print(' | '.join(row))
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,15 @@
 """Extrai tabelas de `uploads/profissionais_por_unidade_do_municipio.pdf` usando pdfplumber.
 Gera CSVs em `uploads/processed/` e um relatório resumo `uploads/processed/profissionais_report.txt`.
+
+Páginas sem indício de tabela (capa, cabeçalhos, totais) não passam por
+extract_tables(); veja worth_table_detection(). Opções:
+  --no-prefilter     roda extract_tables() em todas as páginas
+  --check-prefilter  roda também nas páginas puladas e avisa se alguma tabela seria perdida
 """
 import os
+import re
 import sys
+import time
 from pathlib import Path
 
 try:
@@ -12,79 +19,147 @@ except Exception as e:
     print("Missing required packages. Please install pdfplumber and pandas.")
     raise
 
-ROOT = Path(__file__).resolve().parents[1]
+from page_cache import PageCache, cached_pages
+
+ROOT = Path(__file__).resolve().parents[3]
 IN_PDF = ROOT / 'uploads' / 'profissionais_por_unidade_do_municipio.pdf'
 OUT_DIR = ROOT / 'uploads' / 'processed'
-OUT_DIR.mkdir(parents=True, exist_ok=True)
+PAGE_CACHE = OUT_DIR / 'page_cache'
 
-report = {
-    'input_pdf': str(IN_PDF),
-    'exists': IN_PDF.exists(),
-    'pages': 0,
-    'pages_with_text': 0,
-    'tables_found': 0,
-    'tables_files': []
-}
+cpf_token_re = re.compile(r'(?<!\d)\d{11}(?!\d)')
 
-if not IN_PDF.exists():
-    print(f'PDF not found: {IN_PDF}')
-    sys.exit(2)
 
-try:
-    with pdfplumber.open(IN_PDF) as pdf:
-        report['pages'] = len(pdf.pages)
-        for i, page in enumerate(pdf.pages, start=1):
-            text = page.extract_text()
-            if text and text.strip():
-                report['pages_with_text'] += 1
-            # extract_tables returns list of tables (each table is list of rows)
-            tables = page.extract_tables()
-            if not tables:
-                # Sometimes table extraction fails; try to detect simple table via lines/rects (skip for now)
-                continue
-            for tidx, table in enumerate(tables, start=1):
-                # Convert to DataFrame
-                try:
-                    df = pd.DataFrame(table)
-                    # Remove fully empty columns
-                    df = df.dropna(axis=1, how='all')
-                    # If first row seems like header (no None), promote
-                    header = None
-                    if not df.empty:
-                        first_row = df.iloc[0].tolist()
-                        if all(cell and str(cell).strip() for cell in first_row):
-                            header = [str(c).strip() for c in first_row]
-                            df = df[1:]
-                            df.columns = header
-                    # fallback column names
-                    if df.columns.isnull().any():
-                        df.columns = [f'col_{c}' for c in range(len(df.columns))]
-                    out_name = OUT_DIR / f'profissionais_p{i:03d}_t{tidx:02d}.csv'
-                    df.to_csv(out_name, index=False)
-                    report['tables_found'] += 1
-                    report['tables_files'].append(str(out_name.relative_to(ROOT)))
-                    print(f'Wrote table: {out_name}')
-                except Exception as ex:
-                    print(f'Failed to write table p{i} t{tidx}:', ex)
+def worth_table_detection(page, text):
+    """Decide, com sinais baratos, se vale rodar extract_tables() na página.
+
+    Com a estratégia padrão ("lines") uma célula exige ao menos duas bordas
+    horizontais e duas verticais; sem isso extract_tables() nunca encontra
+    tabela. Além disso, as tabelas do relatório só aparecem em blocos de
+    unidade (cabeçalho `CNES :`) ou em páginas com CPFs de 11 dígitos.
+    """
+    h = v = 0
+    for e in page.edges:
+        if e['orientation'] == 'h':
+            h += 1
+        else:
+            v += 1
+    if h < 2 or v < 2:
+        return False
+    if not text:
+        return True
+    return 'CNES' in text or cpf_token_re.search(text) is not None
+
+
+def main():
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+    prefilter = '--no-prefilter' not in sys.argv
+    check_prefilter = '--check-prefilter' in sys.argv
+
+    report = {
+        'input_pdf': str(IN_PDF),
+        'exists': IN_PDF.exists(),
+        'pages': 0,
+        'pages_with_text': 0,
+        'pages_without_text': [],
+        'tables_found': 0,
+        'tables_files': [],
+        'pages_skipped': [],
+        'tables_seconds': 0.0,
+        'check_seconds': 0.0,
+        'check_missed': [],
+    }
+
+    if not IN_PDF.exists():
+        print(f'PDF not found: {IN_PDF}')
+        sys.exit(2)
+
+    cache = PageCache(IN_PDF, PAGE_CACHE)
+    try:
+        with pdfplumber.open(IN_PDF) as pdf:
+            report['pages'] = len(pdf.pages)
+            for i, page in enumerate(cached_pages(pdf, cache), start=1):
+                text = page.extract_text()
+                if text and text.strip():
+                    report['pages_with_text'] += 1
+                else:
+                    # página escaneada: o texto dela vem do OCR em extract_pdf_text.py
+                    report['pages_without_text'].append(i)
+                if prefilter and not worth_table_detection(page, text):
+                    report['pages_skipped'].append(i)
+                    if check_prefilter:
+                        t0 = time.perf_counter()
+                        if page.extract_tables():
+                            report['check_missed'].append(i)
+                        report['check_seconds'] += time.perf_counter() - t0
+                    continue
+                # extract_tables returns list of tables (each table is list of rows)
+                t0 = time.perf_counter()
+                tables = page.extract_tables()
+                report['tables_seconds'] += time.perf_counter() - t0
+                if not tables:
+                    # Sometimes table extraction fails; try to detect simple table via lines/rects (skip for now)
+                    continue
+                for tidx, table in enumerate(tables, start=1):
+                    # Convert to DataFrame
+                    try:
+                        df = pd.DataFrame(table)
+                        # Remove fully empty columns
+                        df = df.dropna(axis=1, how='all')
+                        # If first row seems like header (no None), promote
+                        header = None
+                        if not df.empty:
+                            first_row = df.iloc[0].tolist()
+                            if all(cell and str(cell).strip() for cell in first_row):
+                                header = [str(c).strip() for c in first_row]
+                                df = df[1:]
+                                df.columns = header
+                        # fallback column names
+                        if df.columns.isnull().any():
+                            df.columns = [f'col_{c}' for c in range(len(df.columns))]
+                        out_name = OUT_DIR / f'profissionais_p{i:03d}_t{tidx:02d}.csv'
+                        df.to_csv(out_name, index=False)
+                        report['tables_found'] += 1
+                        report['tables_files'].append(str(out_name.relative_to(ROOT)))
+                        print(f'Wrote table: {out_name}')
+                    except Exception as ex:
+                        print(f'Failed to write table p{i} t{tidx}:', ex)
+
+    except Exception as e:
+        print('Error processing PDF:', e)
+        raise
+
+    # Write summary report
+    report_file = OUT_DIR / 'profissionais_report.txt'
+    with report_file.open('w', encoding='utf-8') as f:
+        f.write(f"Input PDF: {report['input_pdf']}\n")
+        f.write(f"Exists: {report['exists']}\n")
+        f.write(f"Pages: {report['pages']}\n")
+        f.write(f"Pages with text: {report['pages_with_text']}\n")
+        f.write(f"Pages without text (OCR in extract_pdf_text.py): {report['pages_without_text']}\n")
+        f.write(f"Pages skipped by prefilter: {report['pages_skipped']}\n")
+        f.write(f"Tables found: {report['tables_found']}\n")
+        f.write("Tables files:\n")
+        for p in report['tables_files']:
+            f.write(f" - {p}\n")
+
+    print('\nSummary:')
+    print(f"Pages: {report['pages']}")
+    print(f"Pages with text: {report['pages_with_text']}")
+    if report['pages_without_text']:
+        print(f"Pages without text (OCR in extract_pdf_text.py): {report['pages_without_text']}")
+    print(f"Tables found: {report['tables_found']}")
+    scanned = report['pages'] - len(report['pages_skipped'])
+    if prefilter:
+        print(f"Prefilter skipped {len(report['pages_skipped'])} of {report['pages']} pages")
+        if check_prefilter:
+            print(f"  extract_tables() on skipped pages would take {report['check_seconds']:.2f}s; "
+                  f"pages with tables missed: {report['check_missed'] or 'none'}")
+        elif scanned:
+            saved = report['tables_seconds'] / scanned * len(report['pages_skipped'])
+            print(f"  estimated time saved: up to ~{saved:.2f}s (extract_tables avg {report['tables_seconds'] / scanned:.3f}s/page)")
+    print(f"Page cache: {cache.hits} hits, {cache.misses} parsed")
+    print(f"Report written to: {report_file}")
 
-except Exception as e:
-    print('Error processing PDF:', e)
-    raise
 
-# Write summary report
-report_file = OUT_DIR / 'profissionais_report.txt'
-with report_file.open('w', encoding='utf-8') as f:
-    f.write(f"Input PDF: {report['input_pdf']}\n")
-    f.write(f"Exists: {report['exists']}\n")
-    f.write(f"Pages: {report['pages']}\n")
-    f.write(f"Pages with text: {report['pages_with_text']}\n")
-    f.write(f"Tables found: {report['tables_found']}\n")
-    f.write("Tables files:\n")
-    for p in report['tables_files']:
-        f.write(f" - {p}\n")
-
-print('\nSummary:')
-print(f"Pages: {report['pages']}")
-print(f"Pages with text: {report['pages_with_text']}")
-print(f"Tables found: {report['tables_found']}")
-print(f"Report written to: {report_file}")
+if __name__ == '__main__':
+    main()
@@ -1,21 +1,48 @@
-"""Extrai texto do PDF página a página e salva em uploads/processed/profissionais_text.txt"""
+"""Extrai texto do PDF página a página e salva em uploads/processed/profissionais_text.txt
+Páginas sem camada de texto passam por OCR (ocr_fallback.py); use --no-ocr para desativar."""
+import sys
 from pathlib import Path
 import pdfplumber
 
-ROOT = Path(__file__).resolve().parents[1]
+from ocr_fallback import ocr_pages
+from page_cache import PageCache, cached_pages
+
+ROOT = Path(__file__).resolve().parents[3]
 IN_PDF = ROOT / 'uploads' / 'profissionais_por_unidade_do_municipio.pdf'
 OUT = ROOT / 'uploads' / 'processed' / 'profissionais_text.txt'
-OUT.parent.mkdir(parents=True, exist_ok=True)
+OCR_CACHE = ROOT / 'uploads' / 'processed' / 'ocr_cache'
+PAGE_CACHE = ROOT / 'uploads' / 'processed' / 'page_cache'
+
+
+def main():
+    OUT.parent.mkdir(parents=True, exist_ok=True)
+    texts = []
+    cache = PageCache(IN_PDF, PAGE_CACHE)
+    with pdfplumber.open(IN_PDF) as pdf:
+        for page in cached_pages(pdf, cache):
+            texts.append(page.extract_text())
+    print(f'Page cache: {cache.hits} hits, {cache.misses} parsed')
+
+    missing = [i for i, txt in enumerate(texts, start=1) if not txt]
+    if missing and '--no-ocr' not in sys.argv:
+        ocr, stats = ocr_pages(IN_PDF, missing, OCR_CACHE)
+        for i, txt in ocr.items():
+            texts[i - 1] = txt
+        print(f"OCR: {stats['pages']} pages ({stats['ocr']} OCR'd, {stats['cached']} from cache, "
+              f"{stats['failed']} failed) in {stats['seconds']:.1f}s")
 
-with pdfplumber.open(IN_PDF) as pdf:
     with OUT.open('w', encoding='utf-8') as f:
-        for i, page in enumerate(pdf.pages, start=1):
+        for i, txt in enumerate(texts, start=1):
             f.write(f'---- PAGE {i} ----\n')
-            txt = page.extract_text()
             if txt:
                 f.write(txt)
             else:
                 f.write('[NO TEXT]\n')
             f.write('\n\n')
 
-print('Wrote', OUT)
+    print('Wrote', OUT)
+
+
+# o guard é necessário: o pool de OCR reimporta este módulo em plataformas com spawn (Windows)
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# Streaming ingest of pharmacy/POI JSON exports shaped like data/farmacias_corumba.json
+# (a top-level array of objects with nome_fantasia, endereco, bairro, latitude,
+# longitude, contato, horario).
+#
+# Records are read one at a time (ijson when installed, otherwise an incremental
+# json.JSONDecoder), validated against the Corumbá bounding box, enriched with
+# parsed opening intervals and normalised phones, and written in batches as
+# JSON lines, so memory stays constant in the input size.
+#
+# Usage: python scripts/archive/etl/ingest_pois.py [input.json] [--out=path.jsonl]
+#        [--rejects=path.jsonl] [--bbox=lat_min,lat_max,lon_min,lon_max] [--batch=N]
+import json
+import re
+import sys
+import time
+import unicodedata
+from collections import Counter
+from pathlib import Path
+
+from merge_whatsapp import split_multi
+
+try:
+    import ijson
+except Exception:
+    ijson = None
+
+INPUT = 'data/farmacias_corumba.json'
+BATCH_SIZE = 1000
+# município de Corumbá inteiro (inclui o Pantanal), com folga
+CORUMBA_BBOX = (-20.6, -17.0, -58.3, -55.6)
+DEFAULT_DDD = '67'
+DAYS = ['seg', 'ter', 'qua', 'qui', 'sex', 'sab', 'dom']
+
+# 'seg', 'seg.', 'segunda', 'segunda-feira'
+day_re = re.compile(r'\b(seg|ter|qua|qui|sex|sab|dom)[a-z]*(?:-feira)?\.?')
+day_range_re = re.compile(r'\b(seg|ter|qua|qui|sex|sab|dom)[a-z]*(?:-feira)?\.?\s*(?:a|-|ate)\s*(seg|ter|qua|qui|sex|sab|dom)')
+range_word_re = re.compile(r'-|\b(?:a|ate)\b')
+time_range_re = re.compile(r'(\d{1,2})(?:[:h](\d{2}))?h?\s*(?:-|a|as|ate)\s*(\d{1,2})(?:[:h](\d{2}))?h?')
+
+
+def iter_json_array(f, chunk_size=1 << 16):
+    """Yield the items of a top-level JSON array read incrementally from text file `f`."""
+    decoder = json.JSONDecoder()
+    buf, pos, eof = '', 0, False
+
+    def fill():
+        nonlocal buf, pos, eof
+        chunk = f.read(chunk_size)
+        buf = buf[pos:] + chunk
+        pos = 0
+        eof = not chunk
+
+    def skip_ws():
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos].isspace():
+                pos += 1
+            if pos < len(buf) or eof:
+                return
+            fill()
+
+    skip_ws()
+    if pos >= len(buf) or buf[pos] != '[':
+        raise ValueError('expected a top-level JSON array')
+    pos += 1
+    first = True
+    while True:
+        skip_ws()
+        if pos >= len(buf):
+            raise ValueError('unterminated JSON array')
+        if buf[pos] == ']':
+            return
+        if not first:
+            if buf[pos] != ',':
+                raise ValueError(f'expected "," in JSON array, got {buf[pos]!r}')
+            pos += 1
+            skip_ws()
+        first = False
+        while True:
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()
+                continue
+            if (not eof and isinstance(obj, (int, float)) and not isinstance(obj, bool)
+                    and (end == len(buf) or buf[end] in '.eE+-0123456789')):
+                # a number cut at the buffer edge ('-19.' -> -19) decodes early
+                fill()
+                continue
+            break
+        pos = end
+        yield obj
+
+
+def iter_records(path):
+    if ijson:
+        with open(path, 'rb') as f:
+            yield from ijson.items(f, 'item', use_float=True)
+    else:
+        with open(path, encoding='utf-8') as f:
+            yield from iter_json_array(f)
+
+
+def fold(s):
+    s = unicodedata.normalize('NFD', s.strip().lower())
+    return ''.join(ch for ch in s if unicodedata.category(ch) != 'Mn')
+
+
+def _hhmm(h, m):
+    h, m = int(h), int(m or 0)
+    if h > 24 or m > 59 or (h == 24 and m):
+        raise ValueError
+    return f'{h:02d}:{m:02d}'
+
+
+def _days(prefix):
+    r = day_range_re.search(prefix)
+    if r:
+        a, b = DAYS.index(r.group(1)), DAYS.index(r.group(2))
+        if a == b:
+            # 'domingo a domingo'
+            return list(range(7))
+        return [(a + i) % 7 for i in range((b - a) % 7 + 1)]
+    found = list(day_re.finditer(prefix))
+    for a, b in zip(found, found[1:]):
+        if range_word_re.search(prefix, a.end(), b.start()):
+            # looks like a range day_range_re could not read: don't guess a list
+            return None
+    return sorted({DAYS.index(m.group(1)) for m in found})
+
+
+def parse_horario(horario):
+    """'08:00 - 20:00' / 'seg a sex 8h-18h, sab 8h-12h' / '24 horas' -> intervals.
+
+    Each time range takes the days written between the previous range and it;
+    without any, it keeps the days of the previous range (all days at the start).
+    Returns a list of {'dias': [0=seg .. 6=dom], 'abre': 'HH:MM', 'fecha': 'HH:MM'}
+    ('fecha' < 'abre' means the interval crosses midnight), [] for 'fechado',
+    or None when the text cannot be parsed.
+    """
+    if not horario or not str(horario).strip():
+        return None
+    s = fold(str(horario))
+    if re.fullmatch(r'24\s*(h|hs|horas)', s):
+        return [{'dias': list(range(7)), 'abre': '00:00', 'fecha': '24:00'}]
+    if s == 'fechado':
+        return []
+    intervals = []
+    dias = list(range(7))
+    # days listed without hours ('seg, qua, sex 8h-12h') join the next range
+    pending = []
+    for seg in re.split(r'[;|,\n]', s):
+        seg = seg.strip()
+        if not seg:
+            continue
+        if 'fechado' in seg and not time_range_re.search(seg):
+            # 'dom fechado'
+            pending = []
+            continue
+        start = 0
+        for m in time_range_re.finditer(seg):
+            prefix = _days(seg[start:m.start()])
+            if prefix is None:
+                return None
+            if prefix or pending:
+                dias = sorted(set(pending + prefix))
+                pending = []
+            start = m.end()
+            try:
+                intervals.append({'dias': dias, 'abre': _hhmm(m.group(1), m.group(2)),
+                                  'fecha': _hhmm(m.group(3), m.group(4))})
+            except ValueError:
+                return None
+        if start == 0:
+            found = _days(seg)
+            if not found:
+                return None
+            pending += found
+    if pending:
+        # days left without hours
+        return None
+    return intervals or None
+
+
+def normalize_phone(s, ddd=DEFAULT_DDD):
+    """'(67) 99927-3658' -> '(67) 99927-3658'; '067 3231 1010' -> '(67) 3231-1010';
+    '0800 123 4567' -> '0800 123 4567'; invalid -> None."""
+    digits = re.sub(r'\D', '', s)
+    if digits.startswith('55') and len(digits) in (12, 13):
+        digits = digits[2:]
+    if re.fullmatch(r'0[3589]00\d{6,7}', digits):
+        # 0800/0300/0500/0900 numbers have no area code
+        return f'{digits[:4]} {digits[4:-4]} {digits[-4:]}'
+    # trunk prefix '0' before the area code
+    digits = digits.lstrip('0')
+    if len(digits) in (8, 9):
+        digits = ddd + digits
+    if len(digits) not in (10, 11):
+        return None
+    return f'({digits[:2]}) {digits[2:-4]}-{digits[-4:]}'
+
+
+def normalize_contato(contato):
+    phones = []
+    # split_multi also splits names in merge_whatsapp; ';' only separates phones here
+    for chunk in str(contato or '').split(';'):
+        for part in split_multi(chunk):
+            p = normalize_phone(part)
+            if p and p not in phones:
+                phones.append(p)
+    return phones
+
+
+def validate(rec, bbox=CORUMBA_BBOX):
+    """Returns (clean record, None) or (None, reason)."""
+    if not isinstance(rec, dict):
+        return None, 'registro não é objeto'
+    nome = str(rec.get('nome_fantasia') or '').strip()
+    if not nome:
+        return None, 'sem nome_fantasia'
+    try:
+        lat, lon = float(rec['latitude']), float(rec['longitude'])
+    except (KeyError, TypeError, ValueError):
+        return None, 'coordenadas ausentes ou inválidas'
+    lat_min, lat_max, lon_min, lon_max = bbox
+    if not (lat_min <= lat <= lat_max and lon_min <= lon <= lon_max):
+        if lat_min <= lon <= lat_max and lon_min <= lat <= lon_max:
+            return None, 'latitude/longitude invertidas'
+        return None, 'fora da área de Corumbá'
+    out = dict(rec)
+    out['nome_fantasia'] = nome
+    out['latitude'], out['longitude'] = lat, lon
+    out['horarios'] = parse_horario(rec.get('horario'))
+    out['telefones'] = normalize_contato(rec.get('contato'))
+    return out, None
+
+
+def batched(it, size):
+    batch = []
+    for x in it:
+        batch.append(x)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def ingest(path, out_path, rejects_path, bbox=CORUMBA_BBOX, batch_size=BATCH_SIZE):
+    stats = Counter()
+    reasons = Counter()
+    with open(out_path, 'w', encoding='utf-8') as out, open(rejects_path, 'w', encoding='utf-8') as rej:
+        for batch in batched(iter_records(path), batch_size):
+            ok_lines, rej_lines = [], []
+            for i, rec in enumerate(batch, start=stats['total']):
+                clean, reason = validate(rec, bbox)
+                if clean is None:
+                    reasons[reason] += 1
+                    rej_lines.append(json.dumps({'index': i, 'motivo': reason, 'registro': rec},
+                                                ensure_ascii=False, default=str) + '\n')
+                    continue
+                if clean['horarios'] is None and clean.get('horario'):
+                    stats['horario_nao_reconhecido'] += 1
+                if not clean['telefones'] and clean.get('contato'):
+                    stats['contato_invalido'] += 1
+                ok_lines.append(json.dumps(clean, ensure_ascii=False) + '\n')
+            out.writelines(ok_lines)
+            rej.writelines(rej_lines)
+            stats['total'] += len(batch)
+            stats['ok'] += len(ok_lines)
+            stats['batches'] += 1
+    return stats, reasons
+
+
+def _arg(name, default=None):
+    return next((a.split('=', 1)[1] for a in sys.argv[1:] if a.startswith(f'--{name}=')), default)
+
+
+def main():
+    positional = [a for a in sys.argv[1:] if not a.startswith('--')]
+    path = Path(positional[0] if positional else INPUT)
+    out_path = Path(_arg('out', str(path.with_name(path.stem + '_ingest.jsonl'))))
+    rejects_path = Path(_arg('rejects', str(path.with_name(path.stem + '_rejeitados.jsonl'))))
+    bbox = tuple(float(x) for x in _arg('bbox').split(',')) if _arg('bbox') else CORUMBA_BBOX
+    batch_size = int(_arg('batch', BATCH_SIZE))
+
+    t0 = time.perf_counter()
+    stats, reasons = ingest(path, out_path, rejects_path, bbox, batch_size)
+    dt = time.perf_counter() - t0
+    print(f"Read {stats['total']} records in {stats['batches']} batches ({dt:.2f}s, "
+          f"{'ijson' if ijson else 'stdlib json'})")
+    print(f"  ok: {stats['ok']} -> {out_path}")
+    print(f"  rejected: {stats['total'] - stats['ok']} -> {rejects_path}")
+    for reason, c in reasons.most_common():
+        print(f'    {c:6d}  {reason}')
+    if stats['horario_nao_reconhecido']:
+        print(f"  horario not recognised: {stats['horario_nao_reconhecido']}")
+    if stats['contato_invalido']:
+        print(f"  contato without a valid phone: {stats['contato_invalido']}")
+
+
+if __name__ == '__main__':
+    main()
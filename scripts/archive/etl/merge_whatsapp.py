@@ -28,6 +28,12 @@ def tokenize(s):
     return tokens
 
 
+def split_multi(s):
+    """Split entries that list several items with ' e ', ',', '/' or ' and '."""
+    parts = re.split(r'\s+e\s+|\s*,\s*|/|\s+and\s+', s, flags=re.I)
+    return [p.strip() for p in parts if p.strip()]
+
+
 def load_phones():
     phones = []
     with open(PHONES_CSV, encoding='utf-8', errors='ignore') as f:
@@ -38,9 +44,8 @@ def load_phones():
             name = row[0].strip()
             phone = row[1].strip() if len(row) > 1 else ''
             if not name or not phone: continue
-            # handle entries that list multiple units with ' e ' or ',' or '/' or ' and '
-            parts = re.split(r'\s+e\s+|\s*,\s*|/|\s+and\s+', name, flags=re.I)
-            parts = [p.strip() for p in parts if p.strip()]
+            # handle entries that list multiple units
+            parts = split_multi(name)
             if len(parts) > 1:
                 for p in parts:
                     phones.append((p, phone))
@@ -0,0 +1,96 @@
+"""OCR para páginas do PDF sem camada de texto (anexos escaneados).
+
+Cada página é renderizada e enviada ao Tesseract local (`tesseract` no PATH,
+idioma `por`) em um pool de processos. O resultado é guardado em cache pelo
+SHA-256 da imagem renderizada, então reexecuções pulam páginas já processadas.
+"""
+import hashlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+RESOLUTION = 300
+LANG = 'por'
+
+
+_pdf = None
+_cache_dir = None
+
+
+def render_page(page, resolution=RESOLUTION):
+    """Renderiza uma página do pdfplumber como PNG em tons de cinza."""
+    img = page.to_image(resolution=resolution).original
+    buf = io.BytesIO()
+    img.convert('L').save(buf, format='PNG')
+    return buf.getvalue()
+
+
+def tesseract(png, lang=LANG):
+    proc = subprocess.run(['tesseract', 'stdin', 'stdout', '-l', lang],
+                          input=png, capture_output=True, check=True)
+    return proc.stdout.decode('utf-8', errors='ignore')
+
+
+def _init_worker(pdf_path, cache_dir):
+    # cada processo abre o PDF uma única vez
+    global _pdf, _cache_dir
+    import pdfplumber
+    _pdf = pdfplumber.open(pdf_path)
+    _cache_dir = Path(cache_dir)
+
+
+def _ocr_page(page_no):
+    """Devolve (page_no, texto ou None, 'cached' | 'ocr' | 'failed', erro)."""
+    try:
+        png = render_page(_pdf.pages[page_no - 1])
+    except Exception as e:
+        # pypdfium2 ausente, página corrompida...: a página fica sem texto
+        return page_no, None, 'failed', f'page {page_no}: {e!r}'
+    key = hashlib.sha256(png).hexdigest()
+    cached = _cache_dir / f'{key}.txt'
+    if cached.exists():
+        return page_no, cached.read_text(encoding='utf-8'), 'cached', None
+    try:
+        txt = tesseract(png)
+    except (OSError, subprocess.CalledProcessError) as e:
+        # sem tesseract, idioma ausente, imagem rejeitada...
+        return page_no, None, 'failed', repr(e)
+    # nome temporário único: outro processo pode gravar a mesma chave ao mesmo tempo
+    fd, tmp = tempfile.mkstemp(dir=_cache_dir, prefix=f'{key}.', suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(txt)
+    os.replace(tmp, cached)
+    return page_no, txt, 'ocr', None
+
+
+def ocr_pages(pdf_path, page_numbers, cache_dir, workers=None):
+    """OCR das páginas indicadas (1-based).
+
+    Retorna (textos, stats): textos é {page_no: texto}, sem as páginas cuja
+    renderização ou OCR falhou; stats tem pages, cached, ocr, failed e seconds.
+    """
+    stats = {'pages': len(page_numbers), 'cached': 0, 'ocr': 0, 'failed': 0, 'seconds': 0.0}
+    texts = {}
+    if not page_numbers:
+        return texts, stats
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    t0 = time.perf_counter()
+    errors = set()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(str(pdf_path), str(cache_dir))) as pool:
+        for page_no, txt, status, err in pool.map(_ocr_page, page_numbers):
+            stats[status] += 1
+            if txt is None:
+                errors.add(err)
+            else:
+                texts[page_no] = txt
+    for err in sorted(errors):
+        print(f'OCR failed: {err}', file=sys.stderr)
+    stats['seconds'] = time.perf_counter() - t0
+    return texts, stats
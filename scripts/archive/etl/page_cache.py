@@ -0,0 +1,115 @@
+"""Cache de páginas já analisadas pelo pdfplumber, por documento.
+
+A análise de layout (chars, linhas, retângulos) é a parte cara de
+page.extract_text()/extract_tables(). Este módulo guarda esses objetos em
+`<cache_dir>/<sha256 do PDF>-pdfplumber<versão>/p0001.msgpack`, agrupados por conjunto de
+atributos (colunar) e comprimidos com zlib; sem msgpack instalado, usa
+pickle (`.pkl`). Numa próxima passada, cached_pages() injeta os objetos em
+page._objects (o cache interno do pdfplumber) e o PDF não é reanalisado.
+A versão do pdfplumber faz parte da chave: outra versão pode produzir
+objetos diferentes, então começa um cache novo.
+
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in cached_pages(pdf, PageCache(pdf_path, cache_dir)):
+            page.extract_text()
+"""
+import hashlib
+import os
+import tempfile
+import zlib
+from pathlib import Path
+
+try:
+    import msgpack
+except Exception:
+    msgpack = None
+    import pickle
+
+KINDS = ('char', 'line', 'rect', 'curve')
+# atributos do pdfplumber que não são serializáveis nem usados por texto/tabelas
+SKIP_ATTRS = {'stream'}
+
+
+def pdf_hash(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _pack_objs(objs):
+    """Lista de dicts -> [(chaves, [[índice, valores...], ...]), ...] agrupado pelo conjunto de chaves."""
+    groups = {}
+    for i, obj in enumerate(objs):
+        keys = tuple(k for k in obj if k not in SKIP_ATTRS)
+        groups.setdefault(keys, []).append([i] + [obj[k] for k in keys])
+    return [(list(keys), rows) for keys, rows in groups.items()]
+
+
+def _unpack_objs(groups):
+    # restaura a ordem original: o pdfplumber depende dela
+    objs = [None] * sum(len(rows) for _, rows in groups)
+    for keys, rows in groups:
+        for row in rows:
+            objs[row[0]] = dict(zip(keys, row[1:]))
+    return objs
+
+
+def _dumps(data):
+    if msgpack:
+        return zlib.compress(msgpack.packb(data, use_bin_type=True))
+    return zlib.compress(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _loads(blob):
+    if msgpack:
+        # use_list=False devolve tuplas, como o pdfplumber produz (cores, matrix, pts)
+        return msgpack.unpackb(zlib.decompress(blob), raw=False, use_list=False, strict_map_key=False)
+    return pickle.loads(zlib.decompress(blob))
+
+
+class PageCache:
+    def __init__(self, pdf_path, cache_dir):
+        import pdfplumber
+        self.key = f'{pdf_hash(pdf_path)}-pdfplumber{pdfplumber.__version__}'
+        self.dir = Path(cache_dir) / self.key
+        self.ext = '.msgpack' if msgpack else '.pkl'
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, page_number):
+        return self.dir / f'p{page_number:04d}{self.ext}'
+
+    def load(self, page_number):
+        """Devolve {kind: [...]} com os objetos da página, ou None."""
+        p = self.path(page_number)
+        if not p.exists():
+            return None
+        data = _loads(p.read_bytes())
+        return {kind: _unpack_objs(groups) for kind, groups in data.items()}
+
+    def store(self, page):
+        """Analisa a página (se ainda não analisada) e grava seus objetos."""
+        objects = page.objects
+        data = {kind: _pack_objs(objects[kind]) for kind in KINDS if kind in objects}
+        self.dir.mkdir(parents=True, exist_ok=True)
+        p = self.path(page.page_number)
+        # nome temporário único: outro processo pode gravar a mesma página
+        fd, tmp = tempfile.mkstemp(dir=self.dir, prefix=f'{p.stem}.', suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_dumps(data))
+        os.replace(tmp, p)
+
+
+def cached_pages(pdf, cache):
+    """Itera pdf.pages usando o cache; páginas novas são analisadas e gravadas."""
+    for page in pdf.pages:
+        objects = cache.load(page.page_number)
+        if objects is not None:
+            page._objects = objects
+            cache.hits += 1
+        else:
+            cache.store(page)
+            cache.misses += 1
+        yield page
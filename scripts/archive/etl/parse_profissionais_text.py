@@ -1,54 +1,65 @@
 """Parseia uploads/processed/profissionais_text.txt e gera uploads/processed/profissionais_parsed.csv
 Formato de saída: cnes,unidade,cpf,cns,nome,cbo_code,cbo_text
+
+Com --parallel (opcional --workers=N) o arquivo é mapeado em memória, os
+blocos `CNES: <código> - <nome>` são localizados numa única varredura e
+faixas de bytes com unidades inteiras são parseadas num pool de processos.
+Cada bloco de unidade é independente, então o resultado é o mesmo do modo
+serial, na ordem do documento.
 """
 import re
+import mmap
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import csv
 
-ROOT = Path(__file__).resolve().parents[1]
+from profissional_record import FIELDS, Profissional
+
+ROOT = Path(__file__).resolve().parents[3]
 TXT = ROOT / 'uploads' / 'processed' / 'profissionais_text.txt'
 OUT = ROOT / 'uploads' / 'processed' / 'profissionais_parsed.csv'
 
-text = TXT.read_text(encoding='utf-8')
-# Normalize line endings
-lines = text.splitlines()
-
-units = []
-current = None
-buffer = []
-
 cnes_re = re.compile(r'^CNES\s*:\s*(\d+)\s*-\s*(.+)$')
 # pattern to detect end of a professional record: CBO code like 5-6 digits followed by ' - ' and text
 cbo_end_re = re.compile(r'(\d{5,6})\s*-\s*(.+)$')
+rec_re = re.compile(r'^(\d{11})\s+(\d+)\s+(.+?)\s+(\d{5,6})\s*-\s*(.+)$')
+# candidatos a início de unidade no arquivo bruto; confirmados com cnes_re
+cnes_line_re = re.compile(rb'^CNES[ \t]*:', re.M)
+
+
+def split_units(lines):
+    units = []
+    current = None
+    buffer = []
+    for ln in lines:
+        ln = ln.rstrip()
+        m = cnes_re.search(ln)
+        if m:
+            # flush previous unit
+            if current:
+                units.append((current, buffer))
+            current = (m.group(1).strip(), m.group(2).strip())
+            buffer = []
+            continue
+        # If line indicates total or page header, skip
+        if ln.startswith('Total de Profissionais') or ln.startswith('MS / SAS') or ln.startswith('DATASUS') or ln.startswith('---- PAGE'):
+            continue
+        # skip empty
+        if not ln.strip():
+            continue
+        buffer.append(ln)
 
-for ln in lines:
-    ln = ln.rstrip()
-    m = cnes_re.search(ln)
-    if m:
-        # flush previous unit
-        if current:
-            units.append((current, buffer))
-        current = (m.group(1).strip(), m.group(2).strip())
-        buffer = []
-        continue
-    # If line indicates total or page header, skip
-    if ln.startswith('Total de Profissionais') or ln.startswith('MS / SAS') or ln.startswith('DATASUS') or ln.startswith('---- PAGE'):
-        continue
-    # skip empty
-    if not ln.strip():
-        continue
-    buffer.append(ln)
-
-# flush last
-if current:
-    units.append((current, buffer))
-
-rows = []
-for (cnes, unidade), buf in units:
-    # join buffer lines with space to simplify wrapped names
-    # but preserve boundaries by splitting logical records using CBO pattern
-    joined = ' \n'.join(buf)
-    # find all occurrences where a record ends with CBO pattern
+    # flush last
+    if current:
+        units.append((current, buffer))
+    return units
+
+
+def parse_unit(cnes, unidade, buf):
+    """Devolve os registros (Profissional) de uma unidade."""
+    rows = []
     # strategy: iterate over lines, accumulate until a CBO pattern is seen
     acc = ''
     for ln in buf:
@@ -60,8 +71,6 @@ for (cnes, unidade), buf in units:
         if m:
             # extract cpf, cns, name, cbo code, cbo text
             # cpf: starts with digits (may be 11), then spaces then cns (digits), then name (middle)
-            # Try regex
-            rec_re = re.compile(r'^(\d{11})\s+(\d+)\s+(.+?)\s+(\d{5,6})\s*-\s*(.+)$')
             rm = rec_re.search(acc)
             if rm:
                 cpf = rm.group(1).strip()
@@ -69,7 +78,7 @@ for (cnes, unidade), buf in units:
                 nome = rm.group(3).strip()
                 cbo_code = rm.group(4).strip()
                 cbo_text = rm.group(5).strip()
-                rows.append([cnes, unidade, cpf, cns, nome, cbo_code, cbo_text])
+                rows.append(Profissional(cnes, unidade, cpf, cns, nome, cbo_code, cbo_text))
             else:
                 # fallback: try to split by spaces
                 parts = acc.split()
@@ -88,22 +97,96 @@ for (cnes, unidade), buf in units:
                         # remove cbo part
                         name_part = re.sub(r'\s+%s\s*-\s*%s$' % (re.escape(cbo_code), re.escape(cbo_text)), '', name_part)
                         nome = name_part.strip()
-                        rows.append([cnes, unidade, cpf, cns, nome, cbo_code, cbo_text])
+                        rows.append(Profissional(cnes, unidade, cpf, cns, nome, cbo_code, cbo_text))
                     else:
                         # couldn't parse
                         pass
             acc = ''
-        else:
-            # wait for more lines
-            pass
-
-# write CSV
-OUT.parent.mkdir(parents=True, exist_ok=True)
-with OUT.open('w', encoding='utf-8', newline='') as f:
-    w = csv.writer(f)
-    w.writerow(['cnes','unidade','cpf','cns','nome','cbo_code','cbo_text'])
-    for r in rows:
-        w.writerow(r)
-
-print('Parsed rows:', len(rows))
-print('Wrote', OUT)
+    return rows
+
+
+def parse_lines(lines):
+    rows = []
+    for (cnes, unidade), buf in split_units(lines):
+        rows.extend(parse_unit(cnes, unidade, buf))
+    return rows
+
+
+def unit_offsets(mm):
+    """Offsets (em bytes) de cada linha `CNES: <código> - <nome>`, numa única varredura."""
+    offsets = []
+    for m in cnes_line_re.finditer(mm):
+        end = mm.find(b'\n', m.start())
+        line = mm[m.start():end if end != -1 else len(mm)].decode('utf-8', errors='ignore')
+        if cnes_re.search(line.rstrip()):
+            offsets.append(m.start())
+    return offsets
+
+
+def byte_ranges(offsets, size, n_chunks):
+    """Agrupa unidades consecutivas em até n_chunks faixas de tamanho parecido."""
+    if not offsets:
+        return []
+    # o que vem antes da primeira unidade é descartado pelo parser serial também
+    bounds = offsets + [size]
+    target = max(1, (size - offsets[0]) // n_chunks)
+    ranges = []
+    start = offsets[0]
+    for b in bounds[1:]:
+        if b - start >= target or b == size:
+            ranges.append((start, b))
+            start = b
+    return ranges
+
+
+def _parse_range(args):
+    path, start, end = args
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        chunk = mm[start:end].decode('utf-8')
+    return parse_lines(chunk.splitlines())
+
+
+def parse_parallel(path, workers=None):
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        # sem ganho possível: evita o custo de serializar os registros entre processos
+        return parse_lines(Path(path).read_text(encoding='utf-8').splitlines())
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            offsets = unit_offsets(mm)
+    # várias faixas por worker para equilibrar unidades de tamanhos diferentes
+    jobs = [(str(path), s, e) for s, e in byte_ranges(offsets, size, workers * 8)]
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map preserva a ordem das faixas, logo a ordem do documento
+        for part in pool.map(_parse_range, jobs):
+            rows.extend(part)
+    return rows
+
+
+def main():
+    if '--parallel' in sys.argv:
+        workers = next((int(a.split('=', 1)[1]) for a in sys.argv if a.startswith('--workers=')), None)
+        rows = parse_parallel(TXT, workers)
+    else:
+        text = TXT.read_text(encoding='utf-8')
+        # Normalize line endings
+        rows = parse_lines(text.splitlines())
+
+    # write CSV
+    OUT.parent.mkdir(parents=True, exist_ok=True)
+    with OUT.open('w', encoding='utf-8', newline='') as f:
+        w = csv.writer(f)
+        w.writerow(FIELDS)
+        for r in rows:
+            w.writerow(r)
+
+    print('Parsed rows:', len(rows))
+    print('Wrote', OUT)
+
+
+if __name__ == '__main__':
+    main()
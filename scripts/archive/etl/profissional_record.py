@@ -0,0 +1,44 @@
+"""Registro compacto de profissional, compartilhado por parse_profissionais_text.py
+e clean_profissionais_parsed.py.
+
+Usa __slots__ (sem __dict__ por instância) e interna os campos que se repetem
+milhares de vezes (cnes, unidade, cbo_code, cbo_text), de modo que todos os
+registros de uma mesma unidade/CBO apontam para o mesmo objeto str.
+"""
+import sys
+
+FIELDS = ('cnes', 'unidade', 'cpf', 'cns', 'nome', 'cbo_code', 'cbo_text')
+
+
+class Profissional:
+    __slots__ = FIELDS
+
+    def __init__(self, cnes, unidade, cpf, cns, nome, cbo_code, cbo_text):
+        self.cnes = sys.intern(cnes)
+        self.unidade = sys.intern(unidade)
+        self.cpf = cpf
+        self.cns = cns
+        self.nome = nome
+        self.cbo_code = sys.intern(cbo_code)
+        self.cbo_text = sys.intern(cbo_text)
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(*(d.get(k) or '' for k in FIELDS))
+
+    def __iter__(self):
+        # permite csv.writer.writerow(rec)
+        return (getattr(self, k) for k in FIELDS)
+
+    def __eq__(self, other):
+        return isinstance(other, Profissional) and tuple(self) == tuple(other)
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __reduce__(self):
+        # ao despicklar (pool de processos) passa de novo por __init__ e reinterna
+        return Profissional, tuple(self)
+
+    def __repr__(self):
+        return f'Profissional({", ".join(repr(v) for v in self)})'